@@ -1,12 +1,14 @@
 """A global pool of containers for OFG to pull from to enable quick rebuilding of harnesses and docker container reuse"""
 
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from multiprocessing import Manager, Queue
 from typing import Optional
 
 from experiment.benchmark import Benchmark
-from experiment import oss_fuzz_checkout
 from tool.container_tool import ProjectContainerTool
 
 logger = logging.getLogger(__name__)
@@ -17,25 +19,96 @@ class ContainerPair:
     address_container: ProjectContainerTool
     coverage_container: ProjectContainerTool
 
+
+class _PairRing:
+    """Bounded ring buffer for checking container pairs in and out of the pool.
+
+    Slots are preallocated, so get/put are index updates under one lock with
+    semaphores for backpressure in both directions: no per-operation node
+    allocation, no pickling, and a double release cannot grow the pool past
+    its capacity."""
+
+    def __init__(self, capacity: int):
+        self._slots: list[Optional[ContainerPair]] = [None] * capacity
+        self._capacity = capacity
+        self._head = 0
+        self._tail = 0
+        self._lock = threading.Lock()
+        self._items = threading.Semaphore(0)
+        self._space = threading.Semaphore(capacity)
+
+    def get(self) -> ContainerPair:
+        self._items.acquire()
+        with self._lock:
+            pair = self._slots[self._head]
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % self._capacity
+        self._space.release()
+        return pair
+
+    def put(self, pair: ContainerPair):
+        self._space.acquire()
+        with self._lock:
+            self._slots[self._tail] = pair
+            self._tail = (self._tail + 1) % self._capacity
+        self._items.release()
+
+
 class ContainerPool:
     """This class represents a pool of containers. Each item in the pool has one container instrumented with ASAN and one for coverage"""
     SYSTEM_CORES = 24
 
-    def __init__(self, benchmark: Benchmark, pool_size: int):
-        manager = Manager()
-        self.containers = manager.Queue()
+    def __init__(self, benchmark: Benchmark, pool_size: int, cross_process: bool = False):
+        if cross_process:
+            # A plain multiprocessing.Queue keeps get/put on a single pipe transfer;
+            # Manager().Queue() would proxy every operation through a separate server process.
+            self.containers = multiprocessing.Queue(maxsize=pool_size)
+        else:
+            # The pool is normally shared between trial threads of one process
+            # (containers are the parallelism unit), so checkout can stay
+            # in-process on a preallocated ring with zero pickling and no
+            # feeder thread.
+            self.containers = _PairRing(pool_size)
         logger.info("Initializing %d container pairs for the trial", pool_size)
         cores_per_container = max(1, int(self.SYSTEM_CORES) / pool_size)
-        for _ in range(pool_size):
-            self.containers.put(self.create_container_pair(benchmark, cores_per_container))
+        # Each pair costs tens of seconds of docker builds/runs/execs and is
+        # independent of the others, so warm them concurrently. The work is
+        # docker-IO-bound; cap the workers to avoid overloading the daemon.
+        max_workers = min(pool_size, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.create_container_pair, benchmark, cores_per_container)
+                for _ in range(pool_size)
+            ]
+            for future in as_completed(futures):
+                self.containers.put(future.result())
 
     def create_container_pair(self, benchmark: Benchmark, pool_size: int) -> ContainerPair:
         address = ProjectContainerTool(benchmark=benchmark, sanitizer="address", pool_size=pool_size)
-        coverage = ProjectContainerTool(benchmark=benchmark, sanitizer="coverage", pool_size=pool_size)
+        if address.rebuild_chronos_success:
+            # Chronos-cached images bake the sanitizer's prebuilt artifacts
+            # into the image, so coverage needs its own per-sanitizer build.
+            coverage = ProjectContainerTool(benchmark=benchmark, sanitizer="coverage", pool_size=pool_size)
+        else:
+            # Plain project images are sanitizer-agnostic (`compile` reads
+            # SANITIZER from the environment), so one build serves the pair.
+            coverage = ProjectContainerTool(
+                benchmark=benchmark,
+                sanitizer="coverage",
+                pool_size=pool_size,
+                image_name=address.image_name,
+            )
         return ContainerPair(address, coverage)
 
     def get_container_pair(self) -> Optional[ContainerPair]:
         return self.containers.get()
 
     def release_container_pair(self, pair: ContainerPair):
-        self.containers.put(pair)
\ No newline at end of file
+        self.containers.put(pair)
+
+    def terminate(self):
+        """Shuts down a cross-process queue so its feeder thread does not leak."""
+        # The in-process ring has no resources to release.
+        if not isinstance(self.containers, _PairRing):
+            self.containers.close()
+            self.containers.join_thread()
\ No newline at end of file
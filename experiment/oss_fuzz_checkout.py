@@ -583,7 +583,8 @@ def prepare_project_image_by_name_w_rebuild(project_name: str, sanitizer: str) -
     else:
         logger.warning("Unable to find cached project image for %s", project)
     res = _build_image_w_rebuild(generated_oss_fuzz_project, sanitizer)
-    if res is not None:
+    # _build_image_w_rebuild signals failure with "", not None; fall back to a
+    # plain (sanitizer-agnostic) image build in that case.
+    if res:
         return res
-    else:
-        return _build_image(generated_oss_fuzz_project)
+    return _build_image(generated_oss_fuzz_project)
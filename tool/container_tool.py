@@ -12,13 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """A tool for LLM agents to interact within a project's docker container."""
+import fcntl
+import functools
+import io
 import logging
 import os
 import re
+import shutil
 import subprocess as sp
+import tarfile
+import tempfile
+import threading
 import time
+import uuid
 from typing import Optional
 
+try:
+    import docker
+except ImportError:
+    docker = None
+
 from experiment.benchmark import Benchmark
 from experiment.workdir import WorkDirs
 from experiment import oss_fuzz_checkout
@@ -26,6 +39,59 @@ from tool.base_tool import BaseTool
 
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
+logger.debug(
+    "subprocess posix_spawn enabled: %s", getattr(sp, "_USE_POSIX_SPAWN", False)
+)
+
+# Serializes docker image builds per (project, sanitizer) so concurrent pool
+# warmup does not fire N identical builds before docker's layer cache is
+# populated; later callers with the same key hit the cache instead.
+_image_build_locks: dict[tuple[str, str], threading.Lock] = {}
+_image_build_locks_guard = threading.Lock()
+
+# Maps image_name to the CRIU checkpoint dir of its first warmed container so
+# later pool slots can warm-start via `docker start --checkpoint` instead of a
+# full boot. An empty value means checkpointing was attempted and is
+# unavailable (requires an --experimental daemon with CRIU installed).
+_warm_checkpoints: dict[str, str] = {}
+_warm_checkpoints_guard = threading.Lock()
+WARM_CHECKPOINT_NAME = "ofg-warm"
+
+# Matches the -ofg-cached-* suffix of chronos-cached image names; compiled once
+# since it runs per container during pool warmup.
+_OFG_CACHED_RE = re.compile(r"-ofg-cached-.*$")
+
+# Process-wide docker SDK client. The CLI re-dials /var/run/docker.sock and
+# re-parses its config on every invocation; the SDK client keeps one HTTP
+# session. Set OFG_DOCKER_CLI=1 to force the CLI paths for debugging.
+_docker_api = None
+_docker_api_failed = False
+_docker_api_guard = threading.Lock()
+
+
+def _docker_client():
+    """Returns the shared docker SDK client, or None when the SDK is missing,
+    unusable, or disabled via OFG_DOCKER_CLI=1."""
+    global _docker_api, _docker_api_failed
+    if docker is None or os.getenv("OFG_DOCKER_CLI") == "1":
+        return None
+    with _docker_api_guard:
+        if _docker_api is None and not _docker_api_failed:
+            try:
+                _docker_api = docker.APIClient(
+                    base_url="unix:///var/run/docker.sock"
+                )
+            except Exception as e:
+                logger.error("Failed to create docker SDK client: %s", e)
+                _docker_api_failed = True
+        return _docker_api
+
+
+def _image_build_lock(project_name: str, sanitizer: str) -> threading.Lock:
+    with _image_build_locks_guard:
+        return _image_build_locks.setdefault(
+            (project_name, sanitizer), threading.Lock()
+        )
 """
 Workflow: 
 Initialization:
@@ -41,23 +107,30 @@ Execution Stage:
 
 class ProjectContainerTool(BaseTool):
     """A tool for LLM agents to interact within a project's docker container."""
-    SANITIZERS = ["coverage", "address"]
+    SANITIZERS = frozenset(("coverage", "address"))
 
     def __init__(
-        self, benchmark: Benchmark, sanitizer: str, name: str = "", project_name: str = "", pool_size: int = 4
+        self, benchmark: Benchmark, sanitizer: str, name: str = "", project_name: str = "", pool_size: int = 4, image_name: str = ""
     ) -> None:
         super().__init__(benchmark, name)
-        
+
         self.benchmark = benchmark
         self.sanitizer = sanitizer
         self.project_name = project_name or benchmark.project
         self.pool_size = pool_size
-        
+
         self._validate_sanitizer()
-        self.image_name = self._prepare_project_image(self.project_name, self.sanitizer)
-        self.rebuild_chronos_success = self._check_chronos_build_success()
-        
-        self.generated_oss_fuzz_name = self._get_project_name()
+        if image_name:
+            # Reuse an already-built, sanitizer-agnostic image: `compile` reads
+            # SANITIZER from the environment, so only the OSS-Fuzz project copy
+            # backing this container's artifact mounts has to be unique.
+            self.image_name = image_name
+            self.rebuild_chronos_success = self._check_chronos_build_success()
+            self.generated_oss_fuzz_name = self._create_generated_project()
+        else:
+            self.image_name = self._prepare_project_image(self.project_name, self.sanitizer)
+            self.rebuild_chronos_success = self._check_chronos_build_success()
+            self.generated_oss_fuzz_name = self._get_project_name()
         self.generated_project_path = self._get_project_path()
         
         self.vmap_outdir = get_build_artifact_dir(self.generated_oss_fuzz_name, "out")
@@ -65,17 +138,16 @@ class ProjectContainerTool(BaseTool):
         self.vmap_ccache = get_ccache_dir(self.generated_oss_fuzz_name)
         
         self.container_id = self._start_docker_container()
+        # Checkpoint before any exec session attaches: CRIU refuses to
+        # checkpoint containers with live execs.
+        self._create_warm_checkpoint()
+        self._shell = self._spawn_shell()
+        self._shell_lock = threading.Lock()
         self.build_script_path = "/src/build.sh"
-        self._backup_default_build_script()
-        self.project_dir = self._get_project_dir()
-        
-        if not self.rebuild_chronos_success:
-            self._setup_container_env()
-        
-        self.patch_compile_script()
+        self.project_dir = _image_workdir(self.image_name) or "/src"
+        self._initialize_container()
 
         self.avg_cov_runtime = -1
-        self.total_cov_executions = 0
 
         logger.info(
             "Generated image %s -- container -- %s linked to directory %s",
@@ -84,6 +156,20 @@ class ProjectContainerTool(BaseTool):
             self.generated_project_path,
         )
 
+    def __getstate__(self):
+        """Pairs cross a process boundary when the pool runs cross_process;
+        the persistent shell's pipes and lock cannot be pickled, so drop them
+        and let __setstate__ respawn the session in the receiving process."""
+        state = self.__dict__.copy()
+        state["_shell"] = None
+        state["_shell_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shell_lock = threading.Lock()
+        self._shell = self._spawn_shell()
+
     def _validate_sanitizer(self):
         if self.sanitizer not in self.SANITIZERS:
             raise ValueError(
@@ -98,27 +184,59 @@ class ProjectContainerTool(BaseTool):
 
     def _get_project_name(self) -> str:
         # Strip out -ofg-cached-* tags
-        return re.sub(r"-ofg-cached-.*$", "", os.path.basename(self.image_name))
+        return _OFG_CACHED_RE.sub("", os.path.basename(self.image_name))
+
+    def _create_generated_project(self) -> str:
+        """Creates a fresh OSS-Fuzz project copy for a shared-image container
+        so its /out and /work mounts do not collide with other containers."""
+        generated = oss_fuzz_checkout.rectify_docker_tag(
+            f"{self.project_name}-{uuid.uuid4().hex}"
+        )
+        oss_fuzz_checkout.create_ossfuzz_project_by_name(self.project_name, generated)
+        return generated
 
     def _get_project_path(self) -> str:
         return os.path.join(
             oss_fuzz_checkout.OSS_FUZZ_DIR, "projects", self.generated_oss_fuzz_name
         )
 
-    def patch_compile_script(self) -> str:
-        """
-        Copying the source directory on every recompilation can be extremely time+resource consuming. 
-        Don't re-copy source directory on every build, treat it as a one time cost instead, which is taken care of in _prepare_project_image.
-        I noticed cases where the rebuild itself would take ~7 seconds, while copying would take ~40 seconds when /src was > 1G
-        """
-        compile_path = os.path.join("/usr", "local", "bin", "compile")
-        proc =  self.execute(f"cat {compile_path}")
-        compile_contents = proc.stdout
-        original_cmd = 'COPY_SOURCES_CMD="cp -rL --parents $SRC $WORK /usr/include /usr/local/include $GOPATH $OSSFUZZ_RUSTPATH /rustc $OUT"'
-        new_cmd = 'COPY_SOURCES_CMD="cp -rL --parents $WORK /usr/include /usr/local/include $GOPATH $OSSFUZZ_RUSTPATH /rustc $OUT"'
-        new_contents = compile_contents.replace(original_cmd, new_cmd)
+    def _initialize_container(self) -> None:
+        """Runs all one-time container setup in a single `docker exec`.
 
-        self.write_to_file(new_contents, compile_path)
+        Each `docker exec` costs ~50-200 ms of fork/attach overhead regardless
+        of the command, so the backup of /src/build.sh, the mkdir alias, and
+        the compile-script patch are fused into one bash script. The compile
+        patch stops `compile` from re-copying $SRC on every build: I noticed
+        cases where the rebuild itself would take ~7 seconds, while copying
+        would take ~40 seconds when /src was > 1G.
+        """
+        # set -e so the first failing step (e.g. the build.sh backup) sets the
+        # exit code instead of being masked by a later step succeeding.
+        script_lines = [
+            "set -e",
+            f"cp {self.build_script_path} /src/build.bk.sh",
+        ]
+        if not self.rebuild_chronos_success:
+            # Alias mkdir to mkdir -p so we can reuse build artifacts.
+            script_lines.append(
+                """cat > /etc/profile.d/mkdir.sh <<'OFG_MKDIR_EOF'
+mkdir() { command mkdir -p "$@"; }
+export -f mkdir
+OFG_MKDIR_EOF"""
+            )
+        # The sed pattern includes the literal `$SRC ` it deletes, so re-running
+        # on an already-patched script (e.g. a reused container) is a no-op.
+        script_lines.append(
+            "sed -i 's|COPY_SOURCES_CMD=\"cp -rL --parents $SRC $WORK|"
+            'COPY_SOURCES_CMD="cp -rL --parents $WORK|\' /usr/local/bin/compile'
+        )
+        process = self.execute("\n".join(script_lines))
+        if process.returncode:
+            logger.error(
+                "Failed to initialize container %s of image %s",
+                self.container_id,
+                self.image_name,
+            )
 
     def tutorial(self) -> str:
         """Constructs a tool guide tutorial for LLM agents."""
@@ -126,17 +244,10 @@ class ProjectContainerTool(BaseTool):
             "{FUZZ_TARGET_PATH}", self.benchmark.target_path
         )
 
-    def _setup_container_env(self):
-        """Alias mkdir to mkdir -p so we can reuse build artifacts"""
-        command = """cat > /etc/profile.d/mkdir.sh <<'EOF'
-mkdir() { command mkdir -p "$@"; }
-export -f mkdir
-EOF"""
-        self.execute(command)
-
     def _prepare_project_image(self, project_name: str, sanitizer: str) -> str:
         """Prepares the project's OSS-Fuzz docker image and returns the image name."""
-        image_name = oss_fuzz_checkout.prepare_project_image_by_name_w_rebuild(project_name, sanitizer)
+        with _image_build_lock(project_name, sanitizer):
+            image_name = oss_fuzz_checkout.prepare_project_image_by_name_w_rebuild(project_name, sanitizer)
         if image_name:
             return image_name
         raise RuntimeError(f"Failed to build image for {project_name}")
@@ -149,19 +260,39 @@ EOF"""
         if log_path is not None:
             log_file = open(log_path, "w+")
         try:
-            result = sp.run(
-                command,
-                stdout=sp.PIPE,
-                stderr=log_file,
-                check=False,
-                text=True,
-                encoding="utf-8",
-                errors="ignore",
-            )
-            if log_path is not None:
-                output = f"Logged in {log_path}"
-            else:
+            if log_path is None:
+                # Popen + communicate with widened pipes so a chatty command
+                # (e.g. compile spewing MBs to stderr) cannot stall on a full
+                # OS-default 64 KiB pipe before we start draining it.
+                proc = sp.Popen(
+                    command,
+                    stdout=sp.PIPE,
+                    stderr=sp.PIPE,
+                    text=True,
+                    encoding="utf-8",
+                    errors="ignore",
+                    # PEP 446 already makes Python fds non-inheritable;
+                    # close_fds=False lets subprocess use posix_spawn instead
+                    # of forking this (large-RSS) process per docker call.
+                    close_fds=False,
+                )
+                _widen_pipes(proc)
+                stdout, stderr = proc.communicate()
+                result = sp.CompletedProcess(
+                    command, returncode=proc.returncode, stdout=stdout, stderr=stderr
+                )
                 output = result.stdout
+            else:
+                result = sp.run(
+                    command,
+                    stdout=sp.PIPE,
+                    stderr=log_file,
+                    check=False,
+                    text=True,
+                    encoding="utf-8",
+                    errors="ignore",
+                )
+                output = f"Logged in {log_path}"
             logger.debug(
                 "Executing command (%s) in container %s: Return code %d. STDOUT: %s, "
                 "STDERR: %s",
@@ -194,6 +325,9 @@ EOF"""
                 text=True,
                 encoding="utf-8",
                 errors="ignore",
+                # Allow the posix_spawn fast path; see the note in
+                # _execute_command_in_container.
+                close_fds=False,
             )
 
             logger.debug(
@@ -208,42 +342,20 @@ EOF"""
             logger.error("Executing command (%s) failed with Exception: %s", command, e)
             return sp.CompletedProcess(command, returncode=1, stdout="", stderr="")
 
-    def _backup_default_build_script(self) -> None:
-        """Creates a copy of the human-written /src/build.sh for LLM to use."""
-        backup_command = f"cp {self.build_script_path} /src/build.bk.sh"
-        process = self.execute(backup_command)
-        if process.returncode:
-            logger.error(
-                "Failed to create a backup of %s: %s",
-                self.build_script_path,
-                self.image_name,
-            )
-
-    def _get_project_dir(self) -> str:
-        """Returns the project-under-test's source code directory."""
-        pwd_command = "pwd"
-        process = self.execute(pwd_command)
-        if process.returncode:
-            logger.error("Failed to get the WORKDIR: %s", self.image_name)
-            return ""
-        return process.stdout.strip()
-
-    def _start_docker_container(self) -> str:
-        """Runs the project's OSS-Fuzz image as a background container and returns
-        the container ID."""
-        command = [
-            "docker",
-            "run",
-            "-d",
+    def _docker_container_args(self) -> list[str]:
+        """Returns the docker run/create arguments shared by the cold-boot and
+        CRIU-restore paths."""
+        return [
             "--privileged",
             "--shm-size=2g",
             "--platform",
             "linux/amd64",
             f"--cpus={self.pool_size}",
-            "-t",
             "-e",
             "FUZZING_ENGINE=libfuzzer",
             "-e",
+            f"SANITIZER={self.sanitizer}",
+            "-e",
             "ARCHITECTURE=x86_64",
             "-e",
             f"PROJECT_NAME={self.generated_oss_fuzz_name}",
@@ -259,20 +371,258 @@ EOF"""
             f"{self.vmap_ccache}:/workspace/ccache",
             "--entrypoint=/bin/bash",
             f"{self.image_name}",
+            # Idle without a TTY: docker refuses to checkpoint containers that
+            # have one, and every interaction goes through docker exec anyway.
+            "-c",
+            "sleep infinity",
         ]
+
+    def _start_docker_container(self) -> str:
+        """Runs the project's OSS-Fuzz image as a background container and returns
+        the container ID."""
         os.makedirs(self.vmap_outdir, exist_ok=True)
         os.makedirs(self.vmap_workdir, exist_ok=True)
+        container_id = self._restore_warm_container()
+        if container_id:
+            return container_id
+        command = ["docker", "run", "-d"] + self._docker_container_args()
         result = self._execute_command(command)
         if result.returncode:
             logger.error("Failed to start container of image: %s", self.image_name)
         container_id = result.stdout.strip()
         return container_id
 
+    def _restore_warm_container(self) -> str:
+        """Starts a new container from this image's CRIU warm checkpoint.
+
+        Restoring skips the ~700 ms namespace/network boot of a cold `docker
+        run`. Returns the container ID, or an empty string when no checkpoint
+        exists or the restore fails (callers fall back to `docker run`).
+        """
+        with _warm_checkpoints_guard:
+            checkpoint_dir = _warm_checkpoints.get(self.image_name)
+        if not checkpoint_dir:
+            return ""
+        create = self._execute_command(
+            ["docker", "create"] + self._docker_container_args()
+        )
+        if create.returncode:
+            return ""
+        container_id = create.stdout.strip()
+        start = self._execute_command(
+            [
+                "docker",
+                "start",
+                f"--checkpoint-dir={checkpoint_dir}",
+                f"--checkpoint={WARM_CHECKPOINT_NAME}",
+                container_id,
+            ]
+        )
+        if start.returncode:
+            logger.info(
+                "CRIU restore failed for %s; falling back to docker run",
+                self.image_name,
+            )
+            self._execute_command(["docker", "rm", "-f", container_id])
+            return ""
+        return container_id
+
+    def _create_warm_checkpoint(self) -> None:
+        """Checkpoints the first ready container of this image so the remaining
+        pool slots can warm-start from it."""
+        with _warm_checkpoints_guard:
+            if self.image_name in _warm_checkpoints:
+                return
+            # Reserve the key so concurrent warmers do not also checkpoint.
+            _warm_checkpoints[self.image_name] = ""
+        checkpoint_dir = tempfile.mkdtemp(prefix="ofg-warm-checkpoint-")
+        result = self._execute_command(
+            [
+                "docker",
+                "checkpoint",
+                "create",
+                "--leave-running",
+                f"--checkpoint-dir={checkpoint_dir}",
+                self.container_id,
+                WARM_CHECKPOINT_NAME,
+            ]
+        )
+        if result.returncode:
+            logger.info(
+                "Docker checkpointing unavailable for %s; pool slots will "
+                "cold-boot: %s",
+                self.image_name,
+                result.stderr.strip(),
+            )
+            shutil.rmtree(checkpoint_dir, ignore_errors=True)
+            return
+        with _warm_checkpoints_guard:
+            _warm_checkpoints[self.image_name] = checkpoint_dir
+
+    def _spawn_shell(self) -> Optional[sp.Popen]:
+        """Spawns a long-lived bash session inside the container.
+
+        Every one-shot `docker exec` pays ~50-200 ms of CLI + daemon
+        fork/attach overhead; commands written to a persistent shell cost a
+        single pipe write instead.
+        """
+        try:
+            return sp.Popen(
+                ["docker", "exec", "-i", self.container_id, "/bin/bash"],
+                stdin=sp.PIPE,
+                stdout=sp.PIPE,
+                stderr=sp.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="ignore",
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to spawn persistent shell in container %s: %s",
+                self.container_id,
+                e,
+            )
+            return None
+
+    def _read_shell_segment(self, token: str) -> tuple[str, str]:
+        """Reads shell stdout until a line containing |token| and returns the
+        accumulated text plus the token line's tail."""
+        parts = []
+        while True:
+            line = self._shell.stdout.readline()
+            if not line:
+                raise RuntimeError("Persistent container shell closed unexpectedly")
+            idx = line.find(token)
+            if idx == -1:
+                parts.append(line)
+                continue
+            parts.append(line[:idx])
+            return "".join(parts), line[idx:].rstrip("\n")
+
+    def _execute_in_shell(self, command: str) -> Optional[sp.CompletedProcess]:
+        """Runs |command| through the persistent shell; None means the shell is
+        unusable and the caller should fall back to a one-shot exec."""
+        # Agent-supplied commands routinely have broken quoting; an unbalanced
+        # quote would swallow the sentinel framing below and hang the session.
+        # Syntax-check on the host first and let the one-shot exec path report
+        # the container bash's own error for invalid commands.
+        syntax_check = sp.run(
+            ["/bin/bash", "-n", "-c", command],
+            stdout=sp.DEVNULL,
+            stderr=sp.DEVNULL,
+            check=False,
+            close_fds=False,
+        )
+        if syntax_check.returncode:
+            return None
+        # Unique per call so command output can never collide with the framing.
+        token = f"__OFG_DONE_{os.urandom(8).hex()}__"
+        # The subshell isolates `exit`/`cd` in |command| from the session, and
+        # /dev/null on stdin makes stdin-reading commands (e.g. a bare `cat`)
+        # hit EOF instead of eating the framing, matching one-shot exec.
+        script = (
+            f"( {command}\n) < /dev/null > /tmp/.ofg_cmd_out 2> /tmp/.ofg_cmd_err\n"
+            f'echo "{token}:$?"\n'
+            f"cat /tmp/.ofg_cmd_out\n"
+            f'echo "{token}:out"\n'
+            f"cat /tmp/.ofg_cmd_err\n"
+            f'echo "{token}:err"\n'
+        )
+        try:
+            with self._shell_lock:
+                # Last-resort guard: if the session still wedges, kill it so
+                # readline unblocks and the command is retried via one-shot
+                # exec. Generous because compile can legitimately run long.
+                watchdog = threading.Timer(
+                    self.SHELL_READ_TIMEOUT, self._shell.kill
+                )
+                watchdog.start()
+                try:
+                    self._shell.stdin.write(script)
+                    self._shell.stdin.flush()
+                    _, rc_tail = self._read_shell_segment(token)
+                    stdout, _ = self._read_shell_segment(token)
+                    stderr, _ = self._read_shell_segment(token)
+                finally:
+                    watchdog.cancel()
+            returncode = int(rc_tail.rsplit(":", 1)[1])
+        except Exception as e:
+            logger.error(
+                "Persistent shell in container %s failed for command (%s): %s",
+                self.container_id,
+                command,
+                e,
+            )
+            # A broken shell stays broken (e.g. closed pipe); disable it so
+            # subsequent calls go straight to the one-shot exec path.
+            self._shell = None
+            return None
+        result = sp.CompletedProcess(
+            command, returncode=returncode, stdout=stdout, stderr=stderr
+        )
+        logger.debug(
+            "Executing command (%s) in container %s: Return code %d. STDOUT: %s, "
+            "STDERR: %s",
+            command,
+            self.container_id,
+            result.returncode,
+            result.stdout,
+            result.stderr,
+        )
+        return result
+
+    def _execute_via_sdk(self, command: str) -> Optional[sp.CompletedProcess]:
+        """Runs |command| over the persistent docker SDK session; None means
+        the SDK is unavailable and the caller should shell out to the CLI."""
+        client = _docker_client()
+        if client is None:
+            return None
+        try:
+            exec_id = client.exec_create(
+                self.container_id, ["/bin/bash", "-c", command]
+            )["Id"]
+            # demux=True splits the multiplexed stream; agents iterate on
+            # stderr (compile errors), so it must not be folded into stdout.
+            stdout_bytes, stderr_bytes = client.exec_start(exec_id, demux=True)
+            returncode = client.exec_inspect(exec_id).get("ExitCode") or 0
+        except Exception as e:
+            logger.error(
+                "docker SDK exec failed in container %s for command (%s): %s",
+                self.container_id,
+                command,
+                e,
+            )
+            return None
+        result = sp.CompletedProcess(
+            command,
+            returncode=returncode,
+            stdout=(stdout_bytes or b"").decode("utf-8", errors="ignore"),
+            stderr=(stderr_bytes or b"").decode("utf-8", errors="ignore"),
+        )
+        logger.debug(
+            "Executing command (%s) in container %s: Return code %d. STDOUT: %s, "
+            "STDERR: %s",
+            command,
+            self.container_id,
+            result.returncode,
+            result.stdout,
+            result.stderr,
+        )
+        return result
+
     def execute(
         self, command: str, log_path: Optional[str] = None
     ) -> sp.CompletedProcess:
         """Executes the |command| in the container and returns the output."""
         logger.debug("Executing command (%s) in %s: ", command, self.container_id)
+        if log_path is None and self._shell is not None:
+            result = self._execute_in_shell(command)
+            if result is not None:
+                return result
+        if log_path is None:
+            result = self._execute_via_sdk(command)
+            if result is not None:
+                return result
         execute_command_in_container = [
             "docker",
             "exec",
@@ -353,20 +703,37 @@ EOF"""
                 self.container_id,
             )
 
+    # EMA weight for avg_cov_runtime: a fixed alpha keeps the average tracking
+    # drift (corpus growth, warmup) where a sample-count mean would freeze.
+    COV_RUNTIME_ALPHA = 0.2
+
+    # Watchdog for persistent-shell reads; long enough for a full compile.
+    SHELL_READ_TIMEOUT = 3600
+
     def update_runtime(self, runtime: float) -> None:
-        self.total_cov_executions += 1
         if self.avg_cov_runtime < 0:
             self.avg_cov_runtime = runtime
-        self.avg_cov_runtime += (
-            runtime - self.avg_cov_runtime
-        ) / self.total_cov_executions
+            return
+        alpha = self.COV_RUNTIME_ALPHA
+        self.avg_cov_runtime = (1 - alpha) * self.avg_cov_runtime + alpha * runtime
 
-    def get_coverage(self, corpus_dir: str, harness_name: str= "") -> sp.CompletedProcess:
+    def get_coverage(
+        self, corpus_dir: str, harness_name: str = "", log_path: Optional[str] = None
+    ) -> None:
         """Allocate two minutes for coverage collection"""
-        corpus_size =  len(os.listdir(corpus_dir))
+        corpus_size = _count_dir(corpus_dir)
         if corpus_size == 0:
             logger.warning("Provided corpus path (%s) has no seeds in it!", corpus_dir)
-        logger.debug("Corpus %s has size: %d", corpus_dir, len(os.listdir(corpus_dir)))
+        logger.debug("Corpus %s has size: %d", corpus_dir, corpus_size)
+        if log_path is None:
+            # Include the container id: concurrent trials pass the same
+            # harness name, and a shared path would truncate mid-run and mix
+            # another trial's output into the error tail.
+            log_path = os.path.join(
+                tempfile.gettempdir(),
+                f"ofg-coverage-{harness_name or self.generated_oss_fuzz_name}"
+                f"-{self.container_id[:12]}.log",
+            )
         command = [
             "python3",
             "infra/helper.py",
@@ -382,31 +749,34 @@ EOF"""
         ]
         # add two seconds to the average timeout to accomodate for slower harnesses
         timeout_threshold = self.avg_cov_runtime + 2 if self.avg_cov_runtime > 0 else 30
+        # Stream output to a log file (like fuzz() does) instead of buffering
+        # it all in memory with capture_output; slurp the tail only on error.
         try:
             proc_start = time.perf_counter()
-            proc = sp.run(
-                command,
-                capture_output=True,
-                cwd=oss_fuzz_checkout.OSS_FUZZ_DIR,
-                stdin=sp.DEVNULL,
-                check=True,
-                timeout=timeout_threshold,
-            )
+            with open(log_path, "w") as log_file:
+                sp.run(
+                    command,
+                    stdout=log_file,
+                    stderr=sp.STDOUT,
+                    cwd=oss_fuzz_checkout.OSS_FUZZ_DIR,
+                    stdin=sp.DEVNULL,
+                    check=True,
+                    timeout=timeout_threshold,
+                )
             proc_runtime = time.perf_counter() - proc_start
             self.update_runtime(proc_runtime)
-            logger.debug("Container stdout:\n%s", proc.stdout)
-        except sp.TimeoutExpired as e:
+            logger.debug("Container output logged in %s", log_path)
+        except sp.TimeoutExpired:
             logger.info(
                 "Coverage timed out in %s seconds for harness %s",
                 timeout_threshold,
                 harness_name,
             )
-        except sp.CalledProcessError as e:
+        except sp.CalledProcessError:
             logger.info(
-                "Failed to generate coverage for %s:\n%s\n%s",
+                "Failed to generate coverage for %s:\n%s",
                 self.generated_oss_fuzz_name,
-                e.stdout,
-                e.stderr,
+                _tail_file(log_path),
             )
 
     def rewrite_driver(self, content: str) -> None:
@@ -416,26 +786,127 @@ EOF"""
         self.write_to_file(content, "/src/build.sh")
 
     def write_to_file(self, content: str, file_path: str) -> None:
-        replace_file_content_command = (
-            f'cat << "OFG_EOF" > {file_path}\n{content}\nOFG_EOF'
-        )
-        self.execute(replace_file_content_command)
+        # Stream raw bytes over a tar pipe; embedding |content| in a heredoc
+        # would pay shell quoting/re-parsing costs on large drivers and
+        # silently break if the content itself contains the heredoc sentinel.
+        client = _docker_client()
+        if client is not None:
+            data = content.encode("utf-8")
+            archive = io.BytesIO()
+            with tarfile.open(fileobj=archive, mode="w") as tar:
+                info = tarfile.TarInfo(os.path.basename(file_path))
+                info.size = len(data)
+                # Keep build scripts executable.
+                info.mode = 0o755
+                tar.addfile(info, io.BytesIO(data))
+            try:
+                client.put_archive(
+                    self.container_id, os.path.dirname(file_path) or "/", archive.getvalue()
+                )
+                return
+            except Exception as e:
+                logger.error(
+                    "docker SDK put_archive failed for %s in container %s: %s",
+                    file_path,
+                    self.container_id,
+                    e,
+                )
+        with tempfile.NamedTemporaryFile("w", delete=False) as tmp:
+            tmp.write(content)
+        try:
+            # docker cp preserves the tempfile's mode; keep scripts executable.
+            os.chmod(tmp.name, 0o755)
+            self._execute_command(
+                ["docker", "cp", tmp.name, f"{self.container_id}:{file_path}"]
+            )
+        finally:
+            os.unlink(tmp.name)
 
     def terminate(self) -> bool:
+        if self._shell is not None:
+            try:
+                self._shell.stdin.close()
+                self._shell.wait(timeout=5)
+            except Exception:
+                self._shell.kill()
+            self._shell = None
         return True
 
 
 
+def _widen_pipes(proc: sp.Popen) -> None:
+    """Raises |proc|'s stdout/stderr pipe capacity to 1 MiB (Linux only)."""
+    setpipe_sz = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+    for stream in (proc.stdout, proc.stderr):
+        if stream is None:
+            continue
+        try:
+            fcntl.fcntl(stream.fileno(), setpipe_sz, 1 << 20)
+        except (OSError, ValueError):
+            pass
+
+
+def _tail_file(path: str, limit: int = 16 * 1024) -> str:
+    """Returns the last |limit| bytes of |path| for error logging."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - limit))
+            return f.read().decode("utf-8", errors="ignore")
+    except OSError:
+        return ""
+
+
+def _count_dir(path: str) -> int:
+    """Counts the entries of |path| without materializing the name list."""
+    return sum(1 for _ in os.scandir(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _image_workdir(image_name: str) -> str:
+    """Returns |image_name|'s WORKDIR without starting a shell.
+
+    The value is identical for every container of an image, so one
+    `docker image inspect` replaces a per-container `docker exec pwd`.
+    """
+    result = sp.run(
+        ["docker", "image", "inspect", "-f", "{{.Config.WorkingDir}}", image_name],
+        stdout=sp.PIPE,
+        stderr=sp.PIPE,
+        check=False,
+        text=True,
+        encoding="utf-8",
+        errors="ignore",
+    )
+    if result.returncode:
+        logger.error("Failed to get the WORKDIR: %s", image_name)
+        return ""
+    return result.stdout.strip()
+
+
+# The joins below run several times per container during pool warmup; memoize
+# them, keyed on the checkout dir since clone_oss_fuzz can rebind OSS_FUZZ_DIR.
+@functools.lru_cache(maxsize=1024)
+def _artifact_dir(oss_fuzz_dir: str, generated_project: str, build_artifact: str) -> str:
+    return os.path.join(oss_fuzz_dir, "build", build_artifact, generated_project)
+
+
+@functools.lru_cache(maxsize=1024)
+def _ccache_dir(oss_fuzz_dir: str, generated_project: str) -> str:
+    return os.path.join(oss_fuzz_dir, "ccaches", generated_project, "ccache")
+
+
 def get_build_artifact_dir(generated_project: str, build_artifact: str) -> str:
     """
     Returns the |build_artifact| absolute directory path for |generated_project|.
     """
-    return os.path.join(
-        oss_fuzz_checkout.OSS_FUZZ_DIR, "build", build_artifact, generated_project
+    return _artifact_dir(
+        oss_fuzz_checkout.OSS_FUZZ_DIR, generated_project, build_artifact
     )
 
 def get_ccache_dir(generated_project: str) -> str:
-    return os.path.join(oss_fuzz_checkout.OSS_FUZZ_DIR, "ccaches", generated_project, "ccache")
+    return _ccache_dir(oss_fuzz_checkout.OSS_FUZZ_DIR, generated_project)
 
 def _libfuzzer_args(run_timeout: int) -> list[str]:
     return [